@@ -0,0 +1,136 @@
+#%%
+import argparse
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from data_cleaning import DataCleaning
+from database_utils import DatabaseConnector, _copy_insert
+
+
+def generate_synthetic_orders(n_rows, n_stores=450, n_dates=100000, seed=42):
+    """
+    Generates synthetic orders with matching store details and date events.
+
+    Args:
+        n_rows (int): The number of orders to generate.
+        n_stores (int): The number of distinct stores.
+        n_dates (int): The number of distinct date events.
+        seed (int): The random seed.
+
+    Returns:
+        tuple: The orders, store details and date events DataFrames.
+    """
+    rng = np.random.default_rng(seed)
+    store_codes = np.array([f"ST-{i:07d}" for i in range(n_stores)], dtype=object)
+    store_df = pd.DataFrame({
+        "store_code": store_codes,
+        "country_code": rng.choice(["GB", "DE", "US"], size=n_stores, p=[0.55, 0.2, 0.25]),
+    })
+    date_uuids = np.array([str(uuid.UUID(int=int(i) + 1)) for i in range(n_dates)], dtype=object)
+    date_df = pd.DataFrame({
+        "date_uuid": date_uuids,
+        "year": rng.integers(1992, 2023, size=n_dates),
+    })
+    user_uuids = np.array([str(uuid.uuid4()) for _ in range(200000)], dtype=object)
+    card_numbers = np.array([str(n) for n in rng.integers(10**15, 10**16, size=200000)], dtype=object)
+    product_codes = np.array([f"P{i:03d}-{i % 7}" for i in range(2000)], dtype=object)
+
+    orders_df = pd.DataFrame({
+        "date_uuid": date_uuids[rng.integers(0, n_dates, size=n_rows)],
+        "user_uuid": user_uuids[rng.integers(0, len(user_uuids), size=n_rows)],
+        "card_number": card_numbers[rng.integers(0, len(card_numbers), size=n_rows)],
+        "store_code": store_codes[rng.integers(0, n_stores, size=n_rows)],
+        "product_code": product_codes[rng.integers(0, len(product_codes), size=n_rows)],
+        "product_quantity": rng.integers(1, 20, size=n_rows),
+    })
+    return orders_df, store_df, date_df
+
+
+def time_query(connector, sql):
+    """
+    Runs a reporting query and returns its wall-clock time in seconds and its plan.
+    """
+    with connector.engine.connect() as conn:
+        start = time.perf_counter()
+        conn.execute(text(sql)).fetchall()
+        elapsed = time.perf_counter() - start
+        plan = conn.execute(text(f"EXPLAIN {sql}")).fetchall()
+    return elapsed, "\n".join(row[0] for row in plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partitioned loading of orders_table.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--db-name", default="sales_data_bench",
+                        help="A separate, existing database; do not point this at the warehouse.")
+    parser.add_argument("--user", default="postgres")
+    parser.add_argument("--password", default="postgres")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=5432)
+    parser.add_argument("--include-to-sql", action="store_true",
+                        help="Also time the row-by-row upload_to_db load (slow at 10M rows).")
+    args = parser.parse_args()
+
+    connector = DatabaseConnector(args.db_name, args.user, args.password, args.host, args.port)
+    connector.connect()
+    cleaner = DataCleaning()
+
+    print(f"Generating {args.rows} synthetic orders...")
+    orders_df, store_df, date_df = generate_synthetic_orders(args.rows)
+    orders_df, _ = cleaner.add_orders_partition_key(orders_df, "country", store_df=store_df)
+    orders_df, _ = cleaner.add_orders_partition_key(orders_df, "year", date_df=date_df)
+
+    plain_table = "bench_orders_plain"
+    loads = [
+        ("bench_orders_by_country", "country_code"),
+        ("bench_orders_by_year", "order_year"),
+    ]
+    queries = {
+        "country_code": "SELECT store_code, SUM(product_quantity) FROM {table} "
+                        "WHERE country_code = 'DE' GROUP BY store_code",
+        "order_year": "SELECT country_code, SUM(product_quantity) FROM {table} "
+                      "WHERE order_year = 2019 GROUP BY country_code",
+    }
+    tables = [plain_table, "bench_orders_to_sql"] + [table_name for table_name, _ in loads]
+
+    try:
+        if args.include_to_sql:
+            start = time.perf_counter()
+            connector.upload_to_db(orders_df, "bench_orders_to_sql")
+            print(f"upload_to_db (row-by-row INSERT): {time.perf_counter() - start:.1f}s")
+
+        # Baseline: the same COPY path as the partitioned load, from a single process into a plain table.
+        start = time.perf_counter()
+        orders_df.to_sql(plain_table, con=connector.engine, if_exists="replace", index=False,
+                         method=_copy_insert, chunksize=100000)
+        print(f"single-process COPY, plain table: {time.perf_counter() - start:.1f}s")
+
+        for table_name, partition_column in loads:
+            start = time.perf_counter()
+            connector.upload_partitioned_to_db(orders_df, table_name, partition_column, max_workers=args.workers)
+            print(f"upload_partitioned_to_db ({partition_column}, {args.workers} workers): "
+                  f"{time.perf_counter() - start:.1f}s")
+
+        with connector.engine.begin() as conn:
+            for table_name in [plain_table] + [table_name for table_name, _ in loads]:
+                conn.execute(text(f"ANALYZE {table_name}"))
+
+        for table_name, partition_column in loads:
+            sql = queries[partition_column]
+            elapsed, plan = time_query(connector, sql.format(table=table_name))
+            print(f"\n{table_name} query: {elapsed:.2f}s\n{plan}")
+            elapsed, _ = time_query(connector, sql.format(table=plain_table))
+            print(f"{plain_table} query: {elapsed:.2f}s")
+    finally:
+        with connector.engine.begin() as conn:
+            for table_name in tables:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE"))
+        print("Benchmark tables dropped.")
+
+
+if __name__ == "__main__":
+    main()
+# %%
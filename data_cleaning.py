@@ -203,6 +203,57 @@ class DataCleaning:
             print(f"Error cleaning orders data: {e}")
             return orders_df
 
+    def add_orders_partition_key(self, orders_df, partition_by, store_df=None, date_df=None):
+        """
+        Adds the column used to partition the orders table when it is loaded in partitioned mode.
+        An existing column of the same name is replaced. The orders DataFrame passed in is
+        left unchanged; a new DataFrame is returned.
+
+        Args:
+            orders_df (pd.DataFrame): The cleaned orders data DataFrame.
+            partition_by (str): Either "country" (adds `country_code` looked up from the
+                store details via `store_code`) or "year" (adds `order_year` taken from
+                `order_date`, or from the date events via `date_uuid`).
+            store_df (pd.DataFrame, optional): Cleaned store details, required for "country".
+            date_df (pd.DataFrame, optional): Cleaned date events, used for "year" when the
+                orders have no `order_date` column.
+
+        Returns:
+            tuple: The DataFrame with the partition column added and the column's name,
+                or the original DataFrame and None if the column could not be added.
+        """
+        try:
+            if partition_by == "country":
+                if store_df is None or store_df.empty:
+                    print("Error: Store details are required to partition orders by country.")
+                    return orders_df, None
+                countries = store_df[["store_code", "country_code"]].drop_duplicates(subset=["store_code"])
+                keyed_df = orders_df.drop(columns=["country_code"], errors="ignore")
+                keyed_df = keyed_df.merge(countries, on="store_code", how="left")
+                partition_column = "country_code"
+            elif partition_by == "year":
+                if "order_date" in orders_df.columns:
+                    keyed_df = orders_df.copy()
+                    keyed_df["order_year"] = pd.to_datetime(keyed_df["order_date"], errors="coerce").dt.year
+                elif date_df is not None and not date_df.empty:
+                    years = date_df[["date_uuid", "year"]].drop_duplicates(subset=["date_uuid"])
+                    years = years.rename(columns={"year": "order_year"})
+                    keyed_df = orders_df.drop(columns=["order_year"], errors="ignore")
+                    keyed_df = keyed_df.merge(years, on="date_uuid", how="left")
+                else:
+                    print("Error: An order_date column or date events are required to partition orders by year.")
+                    return orders_df, None
+                keyed_df["order_year"] = keyed_df["order_year"].astype("Int64")
+                partition_column = "order_year"
+            else:
+                print(f"Error: Unsupported partition key: {partition_by}")
+                return orders_df, None
+            print(f"Orders partition key '{partition_column}' added successfully.")
+            return keyed_df, partition_column
+        except Exception as e:
+            print(f"Error adding orders partition key: {e}")
+            return orders_df, None
+
     def clean_date_events_data(self, date_events_df):
         """
         Cleans the date events data by handling NULL values and converting numeric columns.
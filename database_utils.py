@@ -1,8 +1,11 @@
 # database_utils.py
 #%%
+import re
 import yaml
 import pandas as pd
-from sqlalchemy import create_engine
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from io import StringIO
+from sqlalchemy import create_engine, text
 
 
 class DatabaseConnector:
@@ -17,13 +20,18 @@ class DatabaseConnector:
         self.port = port
         self.engine = None
 
+    def get_db_url(self):
+        """
+        Returns the SQLAlchemy connection URL for the PostgreSQL database.
+        """
+        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}"
+
     def connect(self):
         """
         Establishes a connection to the PostgreSQL database using SQLAlchemy.
         """
         try:
-            db_url = f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}"
-            self.engine = create_engine(db_url)
+            self.engine = create_engine(self.get_db_url())
             print(f"Connected to PostgreSQL database '{self.db_name}' successfully.")
         except Exception as e:
             print(f"Error connecting to PostgreSQL database: {e}")
@@ -47,6 +55,260 @@ class DatabaseConnector:
         except Exception as e:
             print(f"Error uploading data to the table '{table_name}': {e}")
 
+    def upload_partitioned_to_db(self, df, table_name, partition_column, max_workers=4, chunk_rows=500000):
+        """
+        Uploads a Pandas DataFrame as a list-partitioned table, one partition per value of
+        `partition_column`. Queries that filter on the partition column only scan the
+        partitions they need. Rows with no partition value go to a DEFAULT partition.
+
+        The new parent and partitions are built under staging names. Worker processes COPY
+        the rows in chunks of `chunk_rows`, so a large partition is shared between workers,
+        and then add a CHECK constraint matching each partition's bounds, which lets ATTACH
+        skip its validation scan. The partitions are attached and swapped in for any existing
+        table in a single transaction; if anything fails, the existing table is left as it was
+        and the staging tables are dropped.
+
+        Each chunk is pickled and sent to a worker, so up to twice `max_workers` chunks are
+        held in memory alongside `df` while loading.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to upload.
+            table_name (str): The name of the parent table to upload the data to.
+            partition_column (str): The column whose values define the partitions.
+            max_workers (int): The number of worker processes loading partitions.
+            chunk_rows (int): The maximum number of rows sent to a worker at a time.
+        """
+        staging_name = f"{table_name}__staging"
+        partitions = []
+        try:
+            if self.engine is None:
+                self.connect()
+            if df.empty:
+                print(f"No data to upload for table: {table_name}.")
+                return
+            if partition_column not in df.columns:
+                print(f"Error: Partition column '{partition_column}' not found for table '{table_name}'.")
+                return
+
+            partitions = _plan_partitions(df, table_name, staging_name, partition_column)
+            parent_ddl = pd.io.sql.get_schema(df, staging_name, con=self.engine)
+            with self.engine.begin() as conn:
+                _drop_tables(conn, staging_name, partitions)
+                conn.exec_driver_sql(f'{parent_ddl} PARTITION BY LIST ("{partition_column}")')
+                for partition in partitions:
+                    conn.exec_driver_sql(f'CREATE TABLE "{partition["staging_name"]}" (LIKE "{staging_name}")')
+
+            db_url = self.get_db_url()
+            copy_tasks = (
+                (db_url, partition["staging_name"], df.iloc[partition["rows"][start:start + chunk_rows]])
+                for partition in partitions
+                for start in range(0, len(partition["rows"]), chunk_rows)
+            )
+            for partition_name, row_count in _run_in_workers(_copy_chunk, copy_tasks, max_workers):
+                print(f"Loaded {row_count} rows into partition '{partition_name}'.")
+
+            check_tasks = (
+                (db_url, partition["staging_name"], partition_column, partition["value"])
+                for partition in partitions
+            )
+            _run_in_workers(_add_partition_check, check_tasks, max_workers)
+
+            # The DEFAULT partition is planned last, so earlier attaches need not scan it.
+            with self.engine.begin() as conn:
+                for partition in partitions:
+                    bound = "DEFAULT" if pd.isna(partition["value"]) else \
+                        f"FOR VALUES IN ({_sql_literal(partition['value'])})"
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{staging_name}" ATTACH PARTITION "{partition["staging_name"]}" {bound}'
+                    )
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{partition["staging_name"]}" DROP CONSTRAINT "{_PARTITION_CHECK_NAME}"'
+                    )
+                _check_replaceable_partitions(conn, table_name, partitions)
+                # Dropping the old parent also drops its partitions. Without CASCADE, any view
+                # depending on the old table makes this fail and the transaction roll back.
+                conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{table_name}"')
+                conn.exec_driver_sql(f'ALTER TABLE "{staging_name}" RENAME TO "{table_name}"')
+                for partition in partitions:
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{partition["staging_name"]}" RENAME TO "{partition["name"]}"'
+                    )
+            print(f"Data uploaded successfully to {len(partitions)} partitions of the table '{table_name}'.")
+        except Exception as e:
+            print(f"Error uploading partitioned data to the table '{table_name}': {e}")
+            try:
+                with self.engine.begin() as conn:
+                    _drop_tables(conn, staging_name, partitions)
+            except Exception as cleanup_error:
+                print(f"Error dropping staging tables for '{table_name}': {cleanup_error}")
+
+
+_PARTITION_CHECK_NAME = "partition_bounds_check"
+
+
+def _plan_partitions(df, table_name, staging_name, partition_column):
+    """
+    Groups the DataFrame's row positions by partition value and names each partition,
+    with the partition for missing values (if any) last.
+
+    Returns:
+        list: One dict per partition with its final `name`, `staging_name`, `value` and `rows`.
+    """
+    partitions = []
+    default_name = f"{table_name}_default"
+    used_names = {default_name}
+    null_partition = None
+    for value, rows in df.groupby(partition_column, dropna=False, sort=True).indices.items():
+        if pd.isna(value):
+            null_partition = {
+                "name": default_name,
+                "staging_name": f"{staging_name}_default",
+                "value": None,
+                "rows": rows,
+            }
+            continue
+        # Slugs never start with or contain "__", so they cannot clash with staging names.
+        slug = re.sub(r"[^0-9a-z]+", "_", str(value).lower()).strip("_")[:20] or "value"
+        suffix = slug
+        counter = 1
+        while f"{table_name}_{suffix}" in used_names:
+            counter += 1
+            suffix = f"{slug}_{counter}"
+        used_names.add(f"{table_name}_{suffix}")
+        partitions.append({
+            "name": f"{table_name}_{suffix}",
+            "staging_name": f"{staging_name}_{suffix}",
+            "value": value,
+            "rows": rows,
+        })
+    if null_partition is not None:
+        partitions.append(null_partition)
+    return partitions
+
+
+def _check_replaceable_partitions(conn, table_name, partitions):
+    """
+    Raises an error if a final partition name is already taken by a table that is not
+    a partition of `table_name`, so the swap never drops an unrelated table.
+    """
+    names = [partition["name"] for partition in partitions]
+    existing = conn.execute(
+        text(
+            "SELECT c.relname, i.inhparent = to_regclass(:parent) AS is_partition "
+            "FROM pg_class c LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+            "WHERE c.relname = ANY(:names) AND pg_table_is_visible(c.oid)"
+        ),
+        {"parent": f'"{table_name}"', "names": names},
+    ).fetchall()
+    for relname, is_partition in existing:
+        if not is_partition:
+            raise ValueError(f"Table '{relname}' already exists and is not a partition of '{table_name}'.")
+
+
+def _drop_tables(conn, staging_name, partitions):
+    """
+    Drops a staging parent table and any of its partitions, attached or not.
+    """
+    conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{staging_name}" CASCADE')
+    for partition in partitions:
+        conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{partition["staging_name"]}"')
+
+
+def _sql_literal(value):
+    """
+    Returns a partition value quoted as a SQL string literal.
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _run_in_workers(func, tasks, max_workers):
+    """
+    Runs `func` over an iterable of argument tuples in worker processes. Tasks are
+    submitted as workers free up, so the iterable is only consumed a few tasks ahead.
+
+    Returns:
+        list: The results, in completion order.
+    """
+    results = []
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        pending = set()
+        for args in tasks:
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+            pending.add(executor.submit(func, *args))
+        results.extend(future.result() for future in as_completed(pending))
+    except Exception:
+        executor.shutdown(cancel_futures=True)
+        raise
+    executor.shutdown()
+    return results
+
+
+def _csv_field(value):
+    """
+    Formats one value for a CSV COPY: None as an unquoted empty field (NULL), anything else quoted.
+    """
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_insert(table, conn, keys, data_iter):
+    """
+    Insertion method for `DataFrame.to_sql` that streams rows through PostgreSQL COPY.
+    Every value is quoted and NULLs are left as unquoted empty fields, so empty strings
+    are loaded as empty strings rather than NULL.
+    """
+    buffer = StringIO()
+    for row in data_iter:
+        buffer.write(",".join(_csv_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    columns = ", ".join(f'"{key}"' for key in keys)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY "{table.name}" ({columns}) FROM STDIN WITH CSV', buffer)
+
+
+def _copy_chunk(db_url, partition_name, chunk_df):
+    """
+    Appends a chunk of rows to an existing partition table. Runs in a worker process,
+    so it opens its own engine.
+
+    Returns:
+        tuple: The partition table name and the number of rows loaded.
+    """
+    engine = create_engine(db_url)
+    try:
+        chunk_df.to_sql(
+            partition_name, con=engine, if_exists="append", index=False,
+            method=_copy_insert, chunksize=100000
+        )
+    finally:
+        engine.dispose()
+    return partition_name, len(chunk_df)
+
+
+def _add_partition_check(db_url, partition_name, partition_column, value):
+    """
+    Adds a CHECK constraint matching a partition's bounds, so attaching it to the parent
+    does not scan it again. Runs in a worker process, so it opens its own engine.
+    """
+    if value is None:
+        condition = f'"{partition_column}" IS NULL'
+    else:
+        condition = f'"{partition_column}" IS NOT NULL AND "{partition_column}" = {_sql_literal(value)}'
+    engine = create_engine(db_url)
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                f'ALTER TABLE "{partition_name}" ADD CONSTRAINT "{_PARTITION_CHECK_NAME}" CHECK ({condition})'
+            )
+    finally:
+        engine.dispose()
+    return partition_name
+
 
 def read_db_creds(file_path):
     """
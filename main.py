@@ -1,12 +1,17 @@
 
 # %%
+import argparse
 from data_extraction import DataExtractor, StoreDetails
 from data_cleaning import DataCleaning
 from database_utils import DatabaseConnector, init_db_engine
 import pandas as pd
 
 
-def main():
+def main(partition_orders_by=None):
+    """
+    Runs the pipeline. `partition_orders_by` ("country" or "year") loads orders_table
+    as a partitioned table instead of a single table.
+    """
     # Step 1: Initialize engines
     aicore_engine = init_db_engine("db_creds.yaml")  # For AiCore RDS instance
     local_db_connector = DatabaseConnector(
@@ -26,6 +31,8 @@ def main():
     # Initialize components
     extractor = DataExtractor(aicore_engine)
     cleaner = DataCleaning()
+    cleaned_store_data = None
+    cleaned_date_events_data = None
 
     # --- USER DATA TASK ---
     try:
@@ -59,16 +66,6 @@ def main():
     except Exception as e:
         print(f"Error during Product Details Task: {e}")
 
-    # --- ORDER DETAILS TASK ---
-    try:
-        print("\n--- Starting Order Details Task ---")
-        order_data = extractor.read_table("orders_table")
-        cleaned_order_data = cleaner.clean_orders_data(order_data)
-        local_db_connector.upload_to_db(cleaned_order_data, "dim_orders")
-        print("Order data uploaded successfully.")
-    except Exception as e:
-        print(f"Error during Order Details Task: {e}")
-
     # --- DATE EVENTS TASK ---
     try:
         print("\n--- Starting Date Events Task ---")
@@ -102,9 +99,35 @@ def main():
     except Exception as e:
         print(f"Error during Store Details Task: {e}")
 
+    # --- ORDER DETAILS TASK ---
+    try:
+        print("\n--- Starting Order Details Task ---")
+        order_data = extractor.read_table("orders_table")
+        cleaned_order_data = cleaner.clean_orders_data(order_data)
+        partition_column = None
+        if partition_orders_by:
+            cleaned_order_data, partition_column = cleaner.add_orders_partition_key(
+                cleaned_order_data, partition_orders_by,
+                store_df=cleaned_store_data, date_df=cleaned_date_events_data
+            )
+        if partition_orders_by and not partition_column:
+            print(f"Error: Could not partition orders by {partition_orders_by}. Skipping orders upload.")
+        elif partition_column:
+            local_db_connector.upload_partitioned_to_db(cleaned_order_data, "orders_table", partition_column)
+            print("Order data uploaded successfully.")
+        else:
+            local_db_connector.upload_to_db(cleaned_order_data, "orders_table")
+            print("Order data uploaded successfully.")
+    except Exception as e:
+        print(f"Error during Order Details Task: {e}")
+
     print("\n--- All tasks completed successfully! ---")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run the data centralization pipeline.")
+    parser.add_argument("--partition-orders-by", choices=["country", "year"],
+                        help="Load orders_table as partitions by store country or order year.")
+    args = parser.parse_args()
+    main(partition_orders_by=args.partition_orders_by)
 # %%
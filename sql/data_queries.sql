@@ -89,6 +89,20 @@ WHERE s.country_code = 'DE'
 GROUP BY s.store_type, s.country_code
 ORDER BY total_sales;
 
+-- Query 8 (partitioned orders_table): Sales by Store-Type in Germany
+-- Same as Query 8, for an orders_table loaded with --partition-orders-by country.
+-- Filtering on orders_table.country_code lets the planner scan only the DE partition;
+-- a filter on dim_store_details.country_code alone cannot prune partitions.
+SELECT 
+      SUM(o.product_quantity * p.product_price) AS total_sales,
+      s.store_type, s.country_code
+FROM orders_table o
+JOIN dim_products p ON o.product_code = p.product_code
+JOIN dim_store_details s ON o.store_code = s.store_code
+WHERE o.country_code = 'DE'
+GROUP BY s.store_type, s.country_code
+ORDER BY total_sales;
+
 -- Query 9: Average Sale Time-Difference by Year
 -- Calculate the average time difference between sales in a year
 WITH sales_with_time_diff AS (